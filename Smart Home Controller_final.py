@@ -1,122 +1,261 @@
 import asyncio
-from datetime import datetime
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
 
 import flet as ft
 
+# Power model (watts)
+_LIGHT_W = 40.0
+_FAN_W_PER_STEP = 20.0
+_HEAT_W = 500.0
+_HEAT_THRESHOLD = 20.0  # °C setpoint above which heating kicks in
+
+# Hot colors/icons bound once - a module-global load is cheaper than the
+# ft.Colors/ft.Icons attribute chain in per-navigation and per-card code.
+_BLUE = ft.Colors.BLUE
+_BLACK = ft.Colors.BLACK
+_GREY = ft.Colors.GREY
+_BLUE_GREY_50 = ft.Colors.BLUE_GREY_50
+
+# Shared text styles for the device cards
+HELPER_STYLE = dict(size=12, color=_GREY)
+CARD_TITLE_STYLE = dict(size=18, weight=ft.FontWeight.BOLD)
+
+async def _yield():
+    """Cooperative yield point for async code in this file.
+
+    Use this - never a small nonzero sleep - when a coroutine just needs to
+    hand control back to the event loop (e.g. to split a large batch of row
+    appends across ticks). sleep(0) takes an optimized fast path in CPython's
+    tasks.py; sleep(0.001)-style waits cost a timer-heap entry and at least a
+    millisecond of added latency per iteration.
+    """
+    await asyncio.sleep(0)
+
+@dataclass(slots=True)
+class DeviceState:
+    """Mutable device state as plain slots - one attribute load on the hot
+    paths (compute_total_power, event handlers) instead of two dict hops."""
+    light_on: bool = False
+    fan_speed: int = 0
+    thermo_setpoint: float = 22.0
+    door_locked: bool = True
+
 def main(page: ft.Page):
     page.title = "Smart Home Controller + Simulator"
     page.padding = 0
-    page.bgcolor = ft.Colors.BLUE_GREY_50
+    page.bgcolor = _BLUE_GREY_50
 
-    # 1/ Simple in-memory "database" of smart home devices and logs
+    # 1/ Simple in-memory "database" of smart home devices and logs.
+    # Static metadata stays in the dict for routing by id; the mutable
+    # fields live on `state`.
     devices = {
-        "light1": {"id": "light1", "name": "Living Room Light", "type": "light", "is_on": False},
-        "fan1": {"id": "fan1", "name": "Ceiling Fan", "type": "fan", "speed": 0},
-        "thermo1": {"id": "thermo1", "name": "Thermostat", "type": "thermostat", "setpoint": 22.0},
-        "door1": {"id": "door1", "name": "Front Door Lock", "type": "lock", "locked": True},
+        "light1": {"id": "light1", "name": "Living Room Light", "type": "light"},
+        "fan1": {"id": "fan1", "name": "Ceiling Fan", "type": "fan"},
+        "thermo1": {"id": "thermo1", "name": "Thermostat", "type": "thermostat"},
+        "door1": {"id": "door1", "name": "Front Door Lock", "type": "lock"},
     }
-    logs = []
-    power_history = []  # List of (timestamp, total_power_usage) tuples
+    state = DeviceState()
+    # Ring buffers: long sessions would otherwise grow the log (and its
+    # cached DataRows) without bound.
+    MAX_LOGS = 1000
+    MAX_DEVICE_LOGS = 200
+    logs = deque(maxlen=MAX_LOGS)
+    # Kept in sync with logs. Stays a plain list (trimmed manually in
+    # append_log): DataTable concatenates columns + rows internally, which
+    # TypeErrors on a deque.
+    log_rows: list[ft.DataRow] = []
+    logs_by_device: dict[str, deque] = {dev_id: deque(maxlen=MAX_DEVICE_LOGS) for dev_id in devices}
+    # Power history as parallel arrays of unboxed doubles (SoA) - no tuple or
+    # float objects on the heap, one contiguous memmove when the window rolls.
+    POWER_WINDOW = 50
+    power_times = array("d")
+    power_values = array("d")
 
     log_table = None
     power_chart = None
+    # Single persistent series: points are appended in handle_message and the
+    # series is handed to each new LineChart, so a sample never rebuilds it.
+    power_series = ft.LineChartData(data_points=[], stroke_width=2)
+    power_max = 0.0  # running max of power_values, maintained on enqueue
+
+    # Helper: publish log. Publishes are batched over a short window so a
+    # burst of events fans out through pubsub as one message.
+    pending_logs: list[dict] = []
+    log_flush_scheduled = False
+
+    def flush_logs():
+        nonlocal log_flush_scheduled
+        log_flush_scheduled = False
+        if not pending_logs:
+            return
+        batch = pending_logs.copy()
+        pending_logs.clear()
+        page.pubsub.send_all({"type": "log_batch", "logs": batch})
 
-    # Helper: publish log
     def publish_log(device_id: str, action: str):
-        msg = {
+        nonlocal log_flush_scheduled
+        pending_logs.append({
             "type": "log",
             "device_id": device_id,
             "action": action,
             "user": "user",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        page.pubsub.send_all(msg)
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        if not log_flush_scheduled:
+            # Sync handlers run on executor threads, so hop to the session
+            # loop to book the timer; latch only once scheduling succeeded.
+            page.loop.call_soon_threadsafe(page.loop.call_later, 0.05, flush_logs)
+            log_flush_scheduled = True
 
     def compute_total_power() -> float:
-        total_power = 0.0
-        light = devices["light1"]
-        fan = devices["fan1"]
-        thermo = devices["thermo1"]
-
-        if light["is_on"]:
-            total_power += 40.0  # watts
-        total_power += fan["speed"] * 20.0  # watts
-        if thermo["setpoint"] > 20:
-            total_power += 500.0  # heating
-        return total_power
+        # Branchless: bools coerce to 0/1 in the multiplies.
+        return (
+            _LIGHT_W * state.light_on
+            + _FAN_W_PER_STEP * state.fan_speed
+            + _HEAT_W * (state.thermo_setpoint > _HEAT_THRESHOLD)
+        )
 
+    # Specialized for the chart's fixed shape: one long-lived series whose
+    # points are appended in place, so a refresh is three scalar bounds
+    # (min_y stays 0 from creation) plus one update() call.
     def update_power_chart():
         nonlocal power_chart
-        if power_chart is None or power_chart.page is None or not power_history:
+        if power_chart is None or power_chart.page is None or not power_times:
             return
-        points = [ft.LineChartDataPoint(x, y) for x, y in power_history]
-        max_power = max(y for _, y in power_history) if power_history else 100
-        power_chart.data_series = [
-            ft.LineChartData(data_points=points, stroke_width=2)
-        ]
-        power_chart.min_x = power_history[0][0]
-        power_chart.max_x = power_history[-1][0]
-        power_chart.min_y = 0
-        power_chart.max_y = max_power + 50
+        power_chart.min_x = power_times[0]
+        power_chart.max_x = power_times[-1]
+        power_chart.max_y = power_max + 50
         power_chart.update()
 
     # pubsub handler
+    def append_log(msg):
+        logs.append(msg)
+        logs_by_device.setdefault(msg["device_id"], deque(maxlen=MAX_DEVICE_LOGS)).append(msg)
+        # The details page snapshots device state and logs; force a rebuild.
+        view_cache.pop(f"/device/{msg['device_id']}", None)
+        log_rows.append(
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(msg["timestamp"])),
+                ft.DataCell(ft.Text(msg["device_id"])),
+                ft.DataCell(ft.Text(msg["action"])),
+                ft.DataCell(ft.Text(msg["user"])),
+            ])
+        )
+        if len(log_rows) > MAX_LOGS:
+            del log_rows[0]
+
+    # Coalesced UI flush: handlers mark what changed and the actual control
+    # updates run once per event-loop iteration, not once per message.
+    log_table_dirty = False
+    power_chart_dirty = False
+    ui_flush_scheduled = False
+
+    def flush_ui():
+        nonlocal log_table_dirty, power_chart_dirty, ui_flush_scheduled
+        ui_flush_scheduled = False
+        if log_table_dirty:
+            log_table_dirty = False
+            if log_table is not None and log_table.page is not None:
+                log_table.update()
+        if power_chart_dirty:
+            power_chart_dirty = False
+            update_power_chart()
+
+    def schedule_ui_flush():
+        nonlocal ui_flush_scheduled
+        if not ui_flush_scheduled:
+            # handle_message arrives on an executor thread; hand the flush to
+            # the session loop and latch only once it is actually queued.
+            page.loop.call_soon_threadsafe(flush_ui)
+            ui_flush_scheduled = True
+
     def handle_message(msg):
-        nonlocal log_table, power_chart
+        nonlocal log_table, power_chart, log_table_dirty, power_chart_dirty
         if not isinstance(msg, dict):
             return
-        if msg.get("type") == "log":
-            logs.append(msg)
-            if log_table is not None:
-                log_table.rows.append(
-                    ft.DataRow(cells=[
-                        ft.DataCell(ft.Text(msg["timestamp"])),
-                        ft.DataCell(ft.Text(msg["device_id"])),
-                        ft.DataCell(ft.Text(msg["action"])),
-                        ft.DataCell(ft.Text(msg["user"])),
-                    ])
-                )
-                log_table.update()
+        # Model updates always run; view updates only when the consuming
+        # control is actually mounted (its .page goes None on detach).
+        if msg.get("type") == "log_batch":
+            for log_msg in msg["logs"]:
+                append_log(log_msg)
+            if log_table is not None and log_table.page is not None:
+                log_table_dirty = True
+                schedule_ui_flush()
+        elif msg.get("type") == "log":
+            append_log(msg)
+            if log_table is not None and log_table.page is not None:
+                log_table_dirty = True
+                schedule_ui_flush()
         elif msg.get("type") == "power_sample":
+            nonlocal power_max
             t = msg["time"]
             p = msg["total_power"]
-            power_history.append((t, p))
-            if len(power_history) > 50:
-                power_history.pop(0)
-            if power_chart is not None:
-                update_power_chart()
+            dropped = power_values[0] if len(power_values) == POWER_WINDOW else None
+            power_times.append(t)
+            power_values.append(p)
+            if dropped is not None:
+                del power_times[0]
+                del power_values[0]
+            if p > power_max:
+                power_max = p
+            elif dropped is not None and dropped >= power_max:
+                # The old max just rolled out of the window; rescan (rare).
+                power_max = max(power_values)
+            power_series.data_points.append(ft.LineChartDataPoint(t, p))
+            if len(power_series.data_points) > POWER_WINDOW:
+                power_series.data_points.pop(0)
+            if power_chart is not None and power_chart.page is not None:
+                power_chart_dirty = True
+                schedule_ui_flush()
 
     page.pubsub.subscribe(handle_message)
 
-    # Background simulator
+    sim_t = 0.0
+    # Set by device handlers to wake the simulator. asyncio.Event is not
+    # thread-safe, so handlers (executor threads) set it through
+    # page.loop.call_soon_threadsafe to actually wake the selector.
+    power_event = asyncio.Event()
+
+    def emit_power_sample():
+        nonlocal sim_t
+        page.pubsub.send_all({"type": "power_sample", "time": sim_t, "total_power": compute_total_power()})
+        sim_t += 1.0
+
+    # Event-driven: sleeps on the event until a device changes, with a 30 s
+    # heartbeat timeout that keeps the x-axis advancing while the home is idle.
     async def simulator_task():
-        t = 0.0
+        emit_power_sample()
         while True:
-            total_power = compute_total_power()
-            page.pubsub.send_all({"type": "power_sample", "time": t, "total_power": total_power})
-            t += 1.0
-            await asyncio.sleep(2)
+            try:
+                await asyncio.wait_for(power_event.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                pass
+            power_event.clear()
+            emit_power_sample()
 
     page.run_task(simulator_task)
 
     # Card factories (fixed ft.Colors usage)
     def create_light_card():
         status_text = ft.Text("Status: OFF", size=16)
-        helper_text = ft.Text("Tap to switch the light", size=12, color=ft.Colors.GREY)
+        helper_text = ft.Text("Tap to switch the light", **HELPER_STYLE)
 
         def toggle_light(e):
-            light = devices["light1"]
-            light["is_on"] = not light["is_on"]
-            if light["is_on"]:
+            state.light_on = not state.light_on
+            if state.light_on:
                 status_text.value = "Status: ON"
                 e.control.text = "Turn OFF"
-                publish_log(light["id"], "Turned ON")
+                publish_log("light1", "Turned ON")
             else:
                 status_text.value = "Status: OFF"
                 e.control.text = "Turn ON"
-                publish_log(light["id"], "Turned OFF")
+                publish_log("light1", "Turned OFF")
             status_text.update()
             e.control.update()
+            page.loop.call_soon_threadsafe(power_event.set)
 
         button = ft.ElevatedButton("Turn ON", on_click=toggle_light)
         details_button = ft.TextButton("Details", on_click=lambda e: page.go("/device/light1"))
@@ -131,7 +270,7 @@ def main(page: ft.Page):
                     ft.Row(
                         controls=[
                             ft.Icon(ft.Icons.LIGHTBULB, size=30, color=ft.Colors.AMBER),
-                            ft.Text("💡 Living Room Light", size=18, weight=ft.FontWeight.BOLD),
+                            ft.Text("💡 Living Room Light", **CARD_TITLE_STYLE),
                         ],
                         spacing=10,
                     ),
@@ -145,20 +284,28 @@ def main(page: ft.Page):
 
     def create_fan_card():
         speed_text = ft.Text("Fan speed: 0")
-        helper_text = ft.Text("Adjust the fan speed (0=OFF, 3=MAX)", size=12, color=ft.Colors.GREY)
+        helper_text = ft.Text("Adjust the fan speed (0=OFF, 3=MAX)", **HELPER_STYLE)
 
-        def change_speed(e):
-            fan = devices["fan1"]
-            # slider value might be float - cast safely
+        # slider value might be float - cast safely
+        def read_speed(e) -> int:
             try:
-                fan["speed"] = int(round(float(e.control.value)))
+                return int(round(float(e.control.value)))
             except Exception:
-                fan["speed"] = 0
-            speed_text.value = f"Fan speed: {fan['speed']}"
+                return 0
+
+        def update_speed_label(e):
+            speed_text.value = f"Fan speed: {read_speed(e)}"
             speed_text.update()
-            publish_log(fan["id"], f"Speed set to {fan['speed']}")
 
-        slider = ft.Slider(min=0, max=3, divisions=3, value=0, label="{value}", on_change=change_speed)
+        def commit_speed(e):
+            state.fan_speed = read_speed(e)
+            publish_log("fan1", f"Speed set to {state.fan_speed}")
+            page.loop.call_soon_threadsafe(power_event.set)
+
+        # on_change fires per drag tick, so it only refreshes the label;
+        # the log/power work happens once on release.
+        slider = ft.Slider(min=0, max=3, divisions=3, value=0, label="{value}",
+                           on_change=update_speed_label, on_change_end=commit_speed)
         details_button = ft.TextButton("Details", on_click=lambda e: page.go("/device/fan1"))
 
         return ft.Container(
@@ -170,8 +317,8 @@ def main(page: ft.Page):
                 controls=[
                     ft.Row(
                         controls=[
-                            ft.Icon(ft.Icons.AIR, size=30, color=ft.Colors.BLUE),
-                            ft.Text("🌀 Ceiling Fan", size=18, weight=ft.FontWeight.BOLD),
+                            ft.Icon(ft.Icons.AIR, size=30, color=_BLUE),
+                            ft.Text("🌀 Ceiling Fan", **CARD_TITLE_STYLE),
                         ],
                         spacing=10,
                     ),
@@ -186,19 +333,25 @@ def main(page: ft.Page):
 
     def create_thermostat_card():
         setpoint_text = ft.Text("Setpoint: 22°C")
-        helper_text = ft.Text("Adjust the temperature", size=12, color=ft.Colors.GREY)
+        helper_text = ft.Text("Adjust the temperature", **HELPER_STYLE)
 
-        def change_temp(e):
+        def read_temp(e) -> float:
             try:
-                val = float(e.control.value)
+                return float(e.control.value)
             except Exception:
-                val = devices["thermo1"]["setpoint"]
-            devices["thermo1"]["setpoint"] = val
-            setpoint_text.value = f"Setpoint: {devices['thermo1']['setpoint']:.1f}°C"
+                return state.thermo_setpoint
+
+        def update_temp_label(e):
+            setpoint_text.value = f"Setpoint: {read_temp(e):.1f}°C"
             setpoint_text.update()
-            publish_log("thermo1", f"Temperature set to {devices['thermo1']['setpoint']:.1f}°C")
 
-        slider = ft.Slider(min=15, max=30, value=22, divisions=30, label="{value}°C", on_change=change_temp)
+        def commit_temp(e):
+            state.thermo_setpoint = read_temp(e)
+            publish_log("thermo1", f"Temperature set to {state.thermo_setpoint:.1f}°C")
+            page.loop.call_soon_threadsafe(power_event.set)
+
+        slider = ft.Slider(min=15, max=30, value=22, divisions=30, label="{value}°C",
+                           on_change=update_temp_label, on_change_end=commit_temp)
         details_button = ft.TextButton("Details", on_click=lambda e: page.go("/device/thermo1"))
 
         return ft.Container(
@@ -211,7 +364,7 @@ def main(page: ft.Page):
                     ft.Row(
                         controls=[
                             ft.Icon(ft.Icons.DEVICE_THERMOSTAT, size=30, color=ft.Colors.RED),
-                            ft.Text("🌡️ Thermostat", size=18, weight=ft.FontWeight.BOLD),
+                            ft.Text("🌡️ Thermostat", **CARD_TITLE_STYLE),
                         ],
                         spacing=10,
                     ),
@@ -226,21 +379,21 @@ def main(page: ft.Page):
 
     def create_door_card():
         status_text = ft.Text("Door: LOCKED", size=16)
-        helper_text = ft.Text("Tap to lock/unlock the door", size=12, color=ft.Colors.GREY)
+        helper_text = ft.Text("Tap to lock/unlock the door", **HELPER_STYLE)
 
         def toggle_lock(e):
-            lock = devices["door1"]
-            lock["locked"] = not lock["locked"]
-            if lock["locked"]:
+            state.door_locked = not state.door_locked
+            if state.door_locked:
                 status_text.value = "Door: LOCKED"
                 e.control.text = "Unlock"
-                publish_log(lock["id"], "Locked")
+                publish_log("door1", "Locked")
             else:
                 status_text.value = "Door: UNLOCKED"
                 e.control.text = "Lock"
-                publish_log(lock["id"], "Unlocked")
+                publish_log("door1", "Unlocked")
             status_text.update()
             e.control.update()
+            page.loop.call_soon_threadsafe(power_event.set)
 
         button = ft.ElevatedButton("Unlock", on_click=toggle_lock)
         details_button = ft.TextButton("Details", on_click=lambda e: page.go("/device/door1"))
@@ -255,7 +408,7 @@ def main(page: ft.Page):
                     ft.Row(
                         controls=[
                             ft.Icon(ft.Icons.DOOR_FRONT_DOOR, size=30, color=ft.Colors.BROWN),
-                            ft.Text("🚪 Front Door", size=18, weight=ft.FontWeight.BOLD),
+                            ft.Text("🚪 Front Door", **CARD_TITLE_STYLE),
                         ],
                         spacing=10,
                     ),
@@ -267,148 +420,172 @@ def main(page: ft.Page):
             ),
         )
 
-    # AppBar builder
+    # AppBar: built once and shared - only one view is attached at a time, so
+    # route changes just flip the two button colors.
+    overview_btn = ft.TextButton("Overview", on_click=lambda e: page.go("/overview"),
+                                 style=ft.ButtonStyle(color=_BLACK))
+    stats_btn = ft.TextButton("Statistics", on_click=lambda e: page.go("/statistics"),
+                              style=ft.ButtonStyle(color=_BLACK))
+    appbar = ft.AppBar(
+        title=ft.Text("Smart Home Controller"),
+        center_title=False,
+        bgcolor=ft.Colors.WHITE,
+        actions=[overview_btn, stats_btn],
+    )
+
     def build_appbar(current_route: str) -> ft.AppBar:
-        return ft.AppBar(
-            title=ft.Text("Smart Home Controller"),
-            center_title=False,
-            bgcolor=ft.Colors.WHITE,
-            actions=[
-                ft.TextButton("Overview", on_click=lambda e: page.go("/overview"),
-                              style=ft.ButtonStyle(color=ft.Colors.BLUE if current_route.startswith("/overview") else ft.Colors.BLACK)),
-                ft.TextButton("Statistics", on_click=lambda e: page.go("/statistics"),
-                              style=ft.ButtonStyle(color=ft.Colors.BLUE if current_route.startswith("/statistics") else ft.Colors.BLACK)),
+        overview_btn.style.color = _BLUE if current_route.startswith("/overview") else _BLACK
+        stats_btn.style.color = _BLUE if current_route.startswith("/statistics") else _BLACK
+        return appbar
+
+    # Built views keyed by route; device entries are dropped in
+    # handle_message whenever that device logs a change.
+    view_cache: dict[str, ft.View] = {}
+
+    # Per-route view builders, dispatched on the first path segment.
+    def build_overview_view(rest: str = "") -> ft.View:
+        return ft.View(
+            route="/overview",
+            appbar=build_appbar("/overview"),
+            controls=[
+                ft.Container(
+                    content=ft.Column(
+                        controls=[
+                            ft.Text("On/Off devices", size=24, weight=ft.FontWeight.BOLD),
+                            ft.Row(controls=[create_light_card(), create_door_card()], wrap=True, spacing=20),
+                            ft.Divider(),
+                            ft.Text("Slider controlled devices", size=24, weight=ft.FontWeight.BOLD),
+                            ft.Row(controls=[create_fan_card(), create_thermostat_card()], wrap=True, spacing=20),
+                        ],
+                        spacing=20,
+                    ),
+                    padding=20,
+                ),
             ],
+            scroll=ft.ScrollMode.AUTO,
+            bgcolor=_BLUE_GREY_50,
         )
 
-    # Routing: simpler string-based approach (more robust)
-    def route_change(route):
+    # Device details (route like /device/light1)
+    def build_device_view(rest: str = "") -> ft.View:
+        dev_id = rest.split("/")[-1]
+        dev = devices.get(dev_id)
+        if dev is None:
+            title = "Unknown Device"
+            info_rows = [ft.Text("Device not found.")]
+        else:
+            title = f"{dev['name']} Details"
+            info_rows = [ft.Text(f"ID: {dev['id']}", size=16), ft.Text(f"Type: {dev['type']}", size=16)]
+            if dev["type"] == "light":
+                info_rows.append(ft.Text(f"State: {'ON' if state.light_on else 'OFF'}", size=16))
+            elif dev["type"] == "fan":
+                info_rows.append(ft.Text(f"Speed: {state.fan_speed}", size=16))
+            elif dev["type"] == "thermostat":
+                info_rows.append(ft.Text(f"Setpoint: {state.thermo_setpoint:.1f}°C", size=16))
+            elif dev["type"] == "lock":
+                info_rows.append(ft.Text(f"Locked: {'Yes' if state.door_locked else 'No'}", size=16))
+
+        device_logs = logs_by_device.get(dev_id, [])
+        log_controls = [ft.Text(f"{log['timestamp']}: {log['action']} by {log['user']}") for log in device_logs]
+
+        return ft.View(
+            route=f"/device/{dev_id}",
+            appbar=build_appbar(f"/device/{dev_id}"),
+            controls=[
+                ft.Container(
+                    content=ft.Column(
+                        controls=[
+                            ft.Text(title, size=24, weight=ft.FontWeight.BOLD),
+                            ft.Column(controls=info_rows, spacing=5),
+                            ft.Divider(),
+                            ft.Text("Recent actions:", size=20, weight=ft.FontWeight.BOLD),
+                            ft.Column(controls=log_controls or [ft.Text("No actions recorded yet.")], spacing=2),
+                            ft.ElevatedButton("Back to Overview", on_click=lambda e: page.go("/overview")),
+                        ],
+                        spacing=15,
+                    ),
+                    padding=20,
+                ),
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            bgcolor=_BLUE_GREY_50,
+        )
+
+    # Statistics
+    def build_statistics_view(rest: str = "") -> ft.View:
         nonlocal log_table, power_chart
+        log_table = ft.DataTable(
+            columns=[
+                ft.DataColumn(ft.Text("Time")),
+                ft.DataColumn(ft.Text("Device")),
+                ft.DataColumn(ft.Text("Action")),
+                ft.DataColumn(ft.Text("User")),
+            ],
+            # Shared by reference: new rows appended in handle_message show
+            # up here without rebuilding the whole table.
+            rows=log_rows,
+        )
+
+        power_chart = ft.LineChart(
+            data_series=[power_series],
+            border=ft.border.all(1, _GREY),
+            horizontal_grid_lines=ft.ChartGridLines(color=ft.Colors.GREY_300, width=0.5),
+            vertical_grid_lines=ft.ChartGridLines(color=ft.Colors.GREY_300, width=0.5),
+            min_x=0, max_x=10, min_y=0, max_y=100,
+            tooltip_bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.BLUE_GREY),
+            animate=1000, expand=True,
+        )
+
+        return ft.View(
+            route="/statistics",
+            appbar=build_appbar("/statistics"),
+            controls=[
+                ft.Container(
+                    content=ft.Column(
+                        controls=[
+                            ft.Text("Power consumption (simulated)", size=24, weight=ft.FontWeight.BOLD),
+                            ft.Container(content=power_chart, height=300, padding=10, border=ft.border.all(1, ft.Colors.GREY_400)),
+                            ft.Divider(),
+                            ft.Text("Action log", size=24, weight=ft.FontWeight.BOLD),
+                            ft.Container(content=log_table, bgcolor=ft.Colors.WHITE, border_radius=12, padding=10),
+                        ],
+                        spacing=20,
+                    ),
+                    padding=20,
+                ),
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            bgcolor=_BLUE_GREY_50,
+        )
+
+    route_builders = {
+        "": build_overview_view,
+        "overview": build_overview_view,
+        "device": build_device_view,
+        "statistics": build_statistics_view,
+    }
+
+    # Routing: dispatch-table keyed on the first path segment
+    def route_change(route):
         page.views.clear()
         r = page.route or "/"
+        if r == "/" or r == "":
+            r = "/overview"
+
+        cached = view_cache.get(r)
+        if cached is not None:
+            build_appbar(r)  # shared AppBar: just recolor the nav buttons
+            page.views.append(cached)
+            page.update()
+            if r == "/statistics":
+                update_power_chart()
+            return
 
-        # Overview
-        if r == "/" or r == "" or r == "/overview":
-            view = ft.View(
-                route="/overview",
-                appbar=build_appbar("/overview"),
-                controls=[
-                    ft.Container(
-                        content=ft.Column(
-                            controls=[
-                                ft.Text("On/Off devices", size=24, weight=ft.FontWeight.BOLD),
-                                ft.Row(controls=[create_light_card(), create_door_card()], wrap=True, spacing=20),
-                                ft.Divider(),
-                                ft.Text("Slider controlled devices", size=24, weight=ft.FontWeight.BOLD),
-                                ft.Row(controls=[create_fan_card(), create_thermostat_card()], wrap=True, spacing=20),
-                            ],
-                            spacing=20,
-                        ),
-                        padding=20,
-                    ),
-                ],
-                scroll=ft.ScrollMode.AUTO,
-                bgcolor=ft.Colors.BLUE_GREY_50,
-            )
-            page.views.append(view)
-
-        # Device details (route like /device/light1)
-        elif r.startswith("/device/"):
-            dev_id = r.split("/")[-1]
-            dev = devices.get(dev_id)
-            if dev is None:
-                title = "Unknown Device"
-                info_rows = [ft.Text("Device not found.")]
-            else:
-                title = f"{dev['name']} Details"
-                info_rows = [ft.Text(f"ID: {dev['id']}", size=16), ft.Text(f"Type: {dev['type']}", size=16)]
-                if dev["type"] == "light":
-                    info_rows.append(ft.Text(f"State: {'ON' if dev['is_on'] else 'OFF'}", size=16))
-                elif dev["type"] == "fan":
-                    info_rows.append(ft.Text(f"Speed: {dev['speed']}", size=16))
-                elif dev["type"] == "thermostat":
-                    info_rows.append(ft.Text(f"Setpoint: {dev['setpoint']:.1f}°C", size=16))
-                elif dev["type"] == "lock":
-                    info_rows.append(ft.Text(f"Locked: {'Yes' if dev['locked'] else 'No'}", size=16))
-
-            device_logs = [log for log in logs if log["device_id"] == dev_id]
-            log_controls = [ft.Text(f"{log['timestamp']}: {log['action']} by {log['user']}") for log in device_logs]
-
-            view = ft.View(
-                route=f"/device/{dev_id}",
-                appbar=build_appbar(f"/device/{dev_id}"),
-                controls=[
-                    ft.Container(
-                        content=ft.Column(
-                            controls=[
-                                ft.Text(title, size=24, weight=ft.FontWeight.BOLD),
-                                ft.Column(controls=info_rows, spacing=5),
-                                ft.Divider(),
-                                ft.Text("Recent actions:", size=20, weight=ft.FontWeight.BOLD),
-                                ft.Column(controls=log_controls or [ft.Text("No actions recorded yet.")], spacing=2),
-                                ft.ElevatedButton("Back to Overview", on_click=lambda e: page.go("/overview")),
-                            ],
-                            spacing=15,
-                        ),
-                        padding=20,
-                    ),
-                ],
-                scroll=ft.ScrollMode.AUTO,
-                bgcolor=ft.Colors.BLUE_GREY_50,
-            )
-            page.views.append(view)
-
-        # Statistics
-        elif r == "/statistics":
-            log_table = ft.DataTable(
-                columns=[
-                    ft.DataColumn(ft.Text("Time")),
-                    ft.DataColumn(ft.Text("Device")),
-                    ft.DataColumn(ft.Text("Action")),
-                    ft.DataColumn(ft.Text("User")),
-                ],
-                rows=[
-                    ft.DataRow(cells=[
-                        ft.DataCell(ft.Text(log["timestamp"])),
-                        ft.DataCell(ft.Text(log["device_id"])),
-                        ft.DataCell(ft.Text(log["action"])),
-                        ft.DataCell(ft.Text(log["user"])),
-                    ]) for log in logs
-                ],
-            )
-
-            power_chart = ft.LineChart(
-                data_series=[],
-                border=ft.border.all(1, ft.Colors.GREY),
-                horizontal_grid_lines=ft.ChartGridLines(color=ft.Colors.GREY_300, width=0.5),
-                vertical_grid_lines=ft.ChartGridLines(color=ft.Colors.GREY_300, width=0.5),
-                min_x=0, max_x=10, min_y=0, max_y=100,
-                tooltip_bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.BLUE_GREY),
-                animate=1000, expand=True,
-            )
-
-            view = ft.View(
-                route="/statistics",
-                appbar=build_appbar("/statistics"),
-                controls=[
-                    ft.Container(
-                        content=ft.Column(
-                            controls=[
-                                ft.Text("Power consumption (simulated)", size=24, weight=ft.FontWeight.BOLD),
-                                ft.Container(content=power_chart, height=300, padding=10, border=ft.border.all(1, ft.Colors.GREY_400)),
-                                ft.Divider(),
-                                ft.Text("Action log", size=24, weight=ft.FontWeight.BOLD),
-                                ft.Container(content=log_table, bgcolor=ft.Colors.WHITE, border_radius=12, padding=10),
-                            ],
-                            spacing=20,
-                        ),
-                        padding=20,
-                    ),
-                ],
-                scroll=ft.ScrollMode.AUTO,
-                bgcolor=ft.Colors.BLUE_GREY_50,
-            )
-            page.views.append(view)
+        head, _, rest = r.strip("/").partition("/")
+        view = route_builders.get(head, build_overview_view)(rest)
+        view_cache[r] = view
+        page.views.append(view)
+        if head == "statistics":
             update_power_chart()
 
         page.update()